@@ -0,0 +1,20 @@
+-- Migration: Add latest_stats_date function
+-- Purpose: Return the most recent PlayerStats date for a season as a single scalar
+-- Run this in Supabase SQL Editor
+--
+-- Previously: SELECT date ... WHERE seasonYear = Y ORDER BY date DESC LIMIT 1 through the REST API
+-- After: supabase.rpc('latest_stats_date', {'season': Y}) - MAX(date) is answered from the
+--        idx_player_stats_monthly_sum ("seasonYear", "date") index
+--
+-- Returns one row; latest_date is NULL when the season has no stats yet
+-- (a table rather than a scalar, since supabase-py expects a JSON array back)
+
+CREATE OR REPLACE FUNCTION latest_stats_date(season int)
+RETURNS TABLE (latest_date date)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT max("date") FROM "PlayerStats" WHERE "seasonYear" = season;
+$$;
+
+COMMENT ON FUNCTION latest_stats_date(int) IS 'Most recent PlayerStats date for a season (NULL if none)';
@@ -0,0 +1,23 @@
+-- Migration: Add Player.mlbPlayerId generated column
+-- Purpose: Store the numeric MLB player ID parsed from "mlbId" once, in the database
+-- Run this in Supabase SQL Editor
+--
+-- Previously: update_stats.py stripped the 'mlb-' prefix from every Player.mlbId and
+--             int()-parsed it on each run to match box score player IDs
+-- After: Postgres keeps "mlbPlayerId" in sync with "mlbId" on every write, so the
+--        Python side reads the integer directly
+--
+-- Handles both "656941" and "mlb-656941"; any other format yields NULL.
+-- Not in schema.prisma (Prisma can't declare generated columns) - nothing writes it.
+
+ALTER TABLE "Player"
+ADD COLUMN IF NOT EXISTS "mlbPlayerId" INTEGER
+GENERATED ALWAYS AS (
+  CASE
+    WHEN "mlbId" ~ '^(mlb-)?[0-9]{1,9}$' THEN regexp_replace("mlbId", '^mlb-', '')::integer
+  END
+) STORED;
+
+CREATE INDEX IF NOT EXISTS "Player_mlbPlayerId_idx" ON "Player"("mlbPlayerId");
+
+COMMENT ON COLUMN "Player"."mlbPlayerId" IS 'Numeric MLB player ID parsed from mlbId (NULL if mlbId is not numeric)';
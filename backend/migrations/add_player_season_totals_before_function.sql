@@ -0,0 +1,27 @@
+-- Migration: Add player_season_totals_before function
+-- Purpose: Return each player's season HR total as of the day before a given date
+-- Run this in Supabase SQL Editor
+--
+-- Previously: The stats updater read the PlayerSeasonTotals view (latest row overall), so
+--             re-running a date or backfilling before existing rows added that day's HRs
+--             on top of totals that already included them
+-- After: supabase.rpc('player_season_totals_before', {...}) returns the latest PlayerStats
+--        row strictly before the date being written, for many players in one call
+--
+-- "playerId" is compared as text so this works whether the column is uuid or text.
+-- player_ids NULL means every player. Players with no stats before the date are omitted.
+
+CREATE OR REPLACE FUNCTION player_season_totals_before(season int, before_date date, player_ids text[])
+RETURNS TABLE ("playerId" text, "hrsTotal" int)
+LANGUAGE sql
+STABLE
+AS $$
+  SELECT DISTINCT ON (ps."playerId") ps."playerId"::text, ps."hrsTotal"
+  FROM "PlayerStats" ps
+  WHERE ps."seasonYear" = season
+    AND ps."date" < before_date
+    AND (player_ids IS NULL OR ps."playerId"::text = ANY(player_ids))
+  ORDER BY ps."playerId", ps."date" DESC;
+$$;
+
+COMMENT ON FUNCTION player_season_totals_before(int, date, text[]) IS 'Latest cumulative HR total per player before a date (latest PlayerStats row with date < before_date)';
@@ -0,0 +1,20 @@
+-- Migration: Add PlayerSeasonTotals view
+-- Purpose: Return each player's current season HR total in a single query
+-- Run this in Supabase SQL Editor
+--
+-- Previously: The Python stats updater issued one ORDER BY date DESC LIMIT 1 query per player
+-- After: One query against this view returns the latest PlayerStats row for every player
+--
+-- DISTINCT ON keeps the first row per (playerId, seasonYear) in ORDER BY order, i.e. the
+-- most recent date. The existing idx_player_stats_player_season_date index matches this order.
+
+CREATE OR REPLACE VIEW "PlayerSeasonTotals" AS
+SELECT DISTINCT ON ("playerId", "seasonYear")
+  "playerId",
+  "seasonYear",
+  "hrsTotal",
+  "date"
+FROM "PlayerStats"
+ORDER BY "playerId", "seasonYear", "date" DESC;
+
+COMMENT ON VIEW "PlayerSeasonTotals" IS 'Latest cumulative HR total per player and season (most recent PlayerStats row)';
@@ -0,0 +1,42 @@
+-- Migration: Add upsert_eligibility function
+-- Purpose: Write the yearly eligibility import (Player + PlayerSeasonStats) in one call
+-- Run this in Supabase SQL Editor
+--
+-- Previously: import_season_stats.py upserted Player and PlayerSeasonStats rows through the
+--             REST API, at least two requests per chunk of players
+-- After: One RPC call (supabase.rpc('upsert_eligibility', {'payload': [...]})) upserts every
+--        player and season total set-based, inside a single transaction
+--
+-- payload: JSON array of {"mlbId", "name", "teamAbbr", "hrsTotal", "seasonYear"} objects
+-- Returns: one row with the number of PlayerSeasonStats rows written
+--          (a table rather than a scalar, since supabase-py expects a JSON array back)
+
+CREATE OR REPLACE FUNCTION upsert_eligibility(payload jsonb)
+RETURNS TABLE (stats_upserted integer)
+LANGUAGE sql
+AS $$
+  WITH players AS (
+    INSERT INTO "Player" ("mlbId", "name", "teamAbbr", "updatedAt")
+    SELECT x->>'mlbId', x->>'name', x->>'teamAbbr', now()
+    FROM jsonb_array_elements(payload) x
+    ON CONFLICT ("mlbId") DO UPDATE
+    SET "name" = excluded."name",
+        "teamAbbr" = excluded."teamAbbr",
+        "updatedAt" = now()
+    RETURNING "id", "mlbId"
+  ),
+  stats AS (
+    INSERT INTO "PlayerSeasonStats" ("playerId", "seasonYear", "hrsTotal", "teamAbbr", "updatedAt")
+    SELECT p."id", (x->>'seasonYear')::int, (x->>'hrsTotal')::int, x->>'teamAbbr', now()
+    FROM jsonb_array_elements(payload) x
+    JOIN players p ON p."mlbId" = x->>'mlbId'
+    ON CONFLICT ("playerId", "seasonYear") DO UPDATE
+    SET "hrsTotal" = excluded."hrsTotal",
+        "teamAbbr" = excluded."teamAbbr",
+        "updatedAt" = now()
+    RETURNING 1
+  )
+  SELECT count(*)::int FROM stats;
+$$;
+
+COMMENT ON FUNCTION upsert_eligibility(jsonb) IS 'Bulk upsert of Player and PlayerSeasonStats rows for the yearly eligibility import';
@@ -4,13 +4,59 @@ Handles all database interactions for player stats updates
 """
 
 import os
+import atexit
+import asyncio
 import logging
-from typing import Optional, List, Dict, Any
-from datetime import datetime
-from supabase import create_client, Client
+from itertools import islice
+from typing import Optional, List, Dict, Any, Iterable, Iterator
+from datetime import datetime, timezone
+from cachetools import TTLCache
+from postgrest import APIError
+from postgrest.types import ReturnMethod
+from supabase import acreate_client, create_client, Client
+from supabase.lib.client_options import AsyncClientOptions, ClientOptions
 
 logger = logging.getLogger(__name__)
 
+# Player rows change rarely during a run; cache lookups for this many seconds
+PLAYER_CACHE_TTL = 300
+
+# Latest stats date only moves when PlayerStats is written; cache reads for this many seconds
+LATEST_DATE_CACHE_TTL = 60
+
+# Cache sentinel, so a cached None ("no stats yet") is distinguishable from a miss
+_MISSING = object()
+
+# Rows per upsert request - keeps each PostgREST payload well under its size limits
+UPSERT_CHUNK_SIZE = 1000
+
+# Chunk upserts in flight at once - stay well below the database connection pool size
+MAX_CONCURRENT_UPSERTS = 4
+
+# Values per in_() filter - the filter is sent in the query string, so keep URLs short
+IN_FILTER_CHUNK_SIZE = 200
+
+
+def utc_now_iso() -> str:
+    """Current UTC time as an ISO 8601 string (compute once per batch, not per row)"""
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def chunked(items: Iterable[Any], size: int = UPSERT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """
+    Split an iterable into lists of at most `size` items
+
+    Args:
+        items: Iterable to split
+        size: Maximum chunk length
+
+    Yields:
+        Consecutive chunks of items
+    """
+    iterator = iter(items)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
+
 
 class SupabaseDB:
     """Supabase database connection and operations"""
@@ -23,7 +69,22 @@ class SupabaseDB:
         if not self.url or not self.key:
             raise ValueError("Missing required environment variables: SUPABASE_URL, SUPABASE_SERVICE_ROLE_KEY")
 
-        self.client: Client = create_client(self.url, self.key)
+        # One client per process: PostgREST requests share a single pooled
+        # HTTP/2 session (needs httpx[http2]), so only the first call pays for TCP+TLS
+        options = ClientOptions(postgrest_client_timeout=30)
+        self.client: Client = create_client(self.url, self.key, options=options)
+        atexit.register(self.client.postgrest.aclose)
+
+        # Request builders are stateless (each select/upsert/update starts a new
+        # request), so build them once instead of on every call
+        self._player_table = self.client.table('Player')
+        self._player_stats_table = self.client.table('PlayerStats')
+
+        # Process-local caches: mlbId -> Player row, and the full Player table
+        self._player_cache: TTLCache = TTLCache(maxsize=2048, ttl=PLAYER_CACHE_TTL)
+        self._all_players_cache: TTLCache = TTLCache(maxsize=1, ttl=PLAYER_CACHE_TTL)
+        # seasonYear -> latest stats date; evicted whenever PlayerStats is written
+        self._latest_date_cache: TTLCache = TTLCache(maxsize=8, ttl=LATEST_DATE_CACHE_TTL)
         logger.info("✅ Supabase client initialized")
 
     def get_player_by_mlb_id(self, mlb_id: str) -> Optional[Dict[str, Any]]:
@@ -36,11 +97,16 @@ class SupabaseDB:
         Returns:
             Player record or None if not found
         """
+        cached = self._player_cache.get(mlb_id)
+        if cached is not None:
+            return cached
+
         try:
             # Prisma uses camelCase column names (no @map directives in schema)
-            response = self.client.table('Player').select('*').eq('mlbId', mlb_id).execute()
+            response = self._player_table.select('*').eq('mlbId', mlb_id).execute()
 
             if response.data and len(response.data) > 0:
+                self._player_cache[mlb_id] = response.data[0]
                 return response.data[0]
             return None
 
@@ -48,6 +114,51 @@ class SupabaseDB:
             logger.error(f"Error fetching player {mlb_id}: {e}")
             return None
 
+    def get_players_by_mlb_ids(self, mlb_ids: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Find many players by MLB ID
+
+        Cached players are returned from memory; the rest are fetched with one
+        in_() query per IN_FILTER_CHUNK_SIZE IDs and added to the cache.
+
+        Args:
+            mlb_ids: MLB IDs in the same format as get_player_by_mlb_id
+
+        Returns:
+            Dictionary mapping mlbId to player record (IDs not found are omitted)
+        """
+        players: Dict[str, Dict[str, Any]] = {}
+        missing = []
+
+        for mlb_id in set(mlb_ids):
+            cached = self._player_cache.get(mlb_id)
+            if cached is not None:
+                players[mlb_id] = cached
+            else:
+                missing.append(mlb_id)
+
+        for chunk in chunked(missing, IN_FILTER_CHUNK_SIZE):
+            try:
+                response = self._player_table.select('*').in_('mlbId', chunk).execute()
+                for player in response.data or []:
+                    self._player_cache[player['mlbId']] = player
+                    players[player['mlbId']] = player
+
+            except Exception as e:
+                logger.error(f"Error fetching {len(chunk)} players by MLB ID: {e}")
+
+        return players
+
+    def prefetch_players(self, mlb_ids: List[str]) -> None:
+        """
+        Load players for many MLB IDs into the cache, so subsequent
+        get_player_by_mlb_id calls are served from memory
+
+        Args:
+            mlb_ids: MLB IDs in the same format as get_player_by_mlb_id
+        """
+        self.get_players_by_mlb_ids(mlb_ids)
+
     def get_all_players(self) -> List[Dict[str, Any]]:
         """
         Get all non-deleted players
@@ -55,10 +166,19 @@ class SupabaseDB:
         Returns:
             List of player records
         """
+        cached = self._all_players_cache.get('all')
+        if cached is not None:
+            return cached
+
         try:
             # Prisma uses camelCase column names (Player model has no deletedAt field)
-            response = self.client.table('Player').select('*').execute()
-            return response.data if response.data else []
+            response = self._player_table.select('*').execute()
+            players = response.data if response.data else []
+
+            self._all_players_cache['all'] = players
+            for player in players:
+                self._player_cache[player['mlbId']] = player
+            return players
 
         except Exception as e:
             logger.error(f"Error fetching all players: {e}")
@@ -83,20 +203,31 @@ class SupabaseDB:
         """
         try:
             # Prisma uses camelCase column names
-            update_data = {'updatedAt': datetime.utcnow().isoformat()}
+            update_data = {'updatedAt': utc_now_iso()}
 
             if team_abbr:
                 update_data['teamAbbr'] = team_abbr
             if name:
                 update_data['name'] = name
 
-            self.client.table('Player').update(update_data).eq('id', player_id).execute()
+            self._player_table.update(
+                update_data,
+                returning=ReturnMethod.minimal
+            ).eq('id', player_id).execute()
+            self._invalidate_player(player_id)
             return True
 
         except Exception as e:
             logger.error(f"Error updating player {player_id} metadata: {e}")
             return False
 
+    def _invalidate_player(self, player_id: str) -> None:
+        """Drop cached copies of a player after it has been written"""
+        self._all_players_cache.clear()
+        for mlb_id, player in list(self._player_cache.items()):
+            if player['id'] == player_id:
+                del self._player_cache[mlb_id]
+
     def upsert_player_stats(
         self,
         player_id: str,
@@ -138,16 +269,17 @@ class SupabaseDB:
                 'hrsTotal': hrs_total,
                 'hrsRegularSeason': hrs_regular_season,
                 'hrsPostseason': hrs_postseason,
-                'lastUpdated': datetime.utcnow().isoformat()
+                'lastUpdated': utc_now_iso()
             }
 
             # Atomic upsert - if record exists (based on unique constraint), update it
             # The unique constraint is on (playerId, seasonYear, date)
-            self.client.table('PlayerStats').upsert(
+            self._player_stats_table.upsert(
                 stats_data,
                 on_conflict='playerId,seasonYear,date'
             ).execute()
 
+            self._latest_date_cache.pop(season_year, None)
             return True
 
         except Exception as e:
@@ -164,20 +296,112 @@ class SupabaseDB:
         Returns:
             Date string in YYYY-MM-DD format or None
         """
+        cached = self._latest_date_cache.get(season_year, _MISSING)
+        if cached is not _MISSING:
+            return cached
+
         try:
-            # Prisma uses camelCase column names
-            response = self.client.table('PlayerStats').select('date').eq(
-                'seasonYear', season_year
-            ).order('date', desc=True).limit(1).execute()
+            # MAX(date) server-side (migrations/add_latest_stats_date_function.sql) -
+            # answered from the (seasonYear, date) index, returns a single row
+            response = self.client.rpc('latest_stats_date', {'season': season_year}).execute()
+            latest_date = response.data[0]['latest_date'] if response.data else None
 
-            if response.data and len(response.data) > 0:
-                return response.data[0]['date']
-            return None
+        except Exception as e:
+            logger.warning(f"latest_stats_date RPC failed, querying PlayerStats instead: {e}")
+
+            try:
+                # Prisma uses camelCase column names
+                response = self._player_stats_table.select('date').eq(
+                    'seasonYear', season_year
+                ).order('date', desc=True).limit(1).execute()
+                latest_date = response.data[0]['date'] if response.data else None
+
+            except Exception as e:
+                logger.error(f"Error fetching latest stats date: {e}")
+                return None
+
+        self._latest_date_cache[season_year] = latest_date
+        return latest_date
+
+    def get_player_season_totals(
+        self,
+        season_year: int,
+        player_ids: Optional[List[str]] = None,
+        before_date: Optional[str] = None
+    ) -> Optional[Dict[str, int]]:
+        """
+        Get season total home runs for many players in one query
+
+        Without before_date, reads the PlayerSeasonTotals view (latest PlayerStats
+        row per player and season, see migrations/add_player_season_totals_view.sql).
+        With before_date, calls the player_season_totals_before function (latest row
+        dated before it, see migrations/add_player_season_totals_before_function.sql).
+        If either can't be read, e.g. the migration has not been applied yet, falls
+        back to one PlayerStats query per player.
+
+        Args:
+            season_year: Season year
+            player_ids: Player UUIDs to fetch (None for every player with stats)
+            before_date: Only count stats dated before this date (YYYY-MM-DD), None for all
+
+        Returns:
+            Dictionary mapping player UUID to total home runs (players without stats
+            are omitted), or None if the totals could not be read
+        """
+        totals: Dict[str, int] = {}
+
+        try:
+            if before_date is None:
+                batches = [None] if player_ids is None else chunked(player_ids, IN_FILTER_CHUNK_SIZE)
+                for batch in batches:
+                    query = self.client.table('PlayerSeasonTotals').select('playerId,hrsTotal').eq(
+                        'seasonYear', season_year
+                    )
+                    if batch is not None:
+                        query = query.in_('playerId', batch)
+
+                    response = query.execute()
+                    for row in response.data or []:
+                        totals[row['playerId']] = row['hrsTotal']
+            else:
+                response = self.client.rpc('player_season_totals_before', {
+                    'season': season_year,
+                    'before_date': before_date,
+                    'player_ids': player_ids
+                }).execute()
+                for row in response.data or []:
+                    totals[row['playerId']] = row['hrsTotal']
+
+            return totals
 
         except Exception as e:
-            logger.error(f"Error fetching latest stats date: {e}")
+            logger.warning(f"Bulk season totals query failed for {season_year}, querying per player: {e}")
+
+        if player_ids is None:
+            logger.error(f"Error fetching season totals for {season_year}: no player IDs to fall back on")
             return None
 
+        totals = {}
+        for player_id in player_ids:
+            try:
+                # Prisma uses camelCase column names
+                query = self._player_stats_table.select('hrsTotal').eq(
+                    'playerId', player_id
+                ).eq('seasonYear', season_year)
+                if before_date is not None:
+                    query = query.lt('date', before_date)
+
+                response = query.order('date', desc=True).limit(1).execute()
+
+                if response.data:
+                    totals[player_id] = response.data[0]['hrsTotal']
+
+            except Exception as e:
+                logger.error(f"Error fetching season total for player {player_id}: {e}")
+                return None
+
+        return totals
+
     def get_player_season_total(self, player_id: str, season_year: int) -> int:
         """
         Get player's current season total home runs
@@ -189,19 +413,136 @@ class SupabaseDB:
         Returns:
             Total home runs or 0 if no stats found
         """
-        try:
-            # Prisma uses camelCase column names
-            response = self.client.table('PlayerStats').select('hrsTotal').eq(
-                'playerId', player_id
-            ).eq('seasonYear', season_year).order('date', desc=True).limit(1).execute()
+        totals = self.get_player_season_totals(season_year, [player_id]) or {}
+        return totals.get(player_id, 0)
 
-            if response.data and len(response.data) > 0:
-                return response.data[0]['hrsTotal']
-            return 0
+    def _upsert_stats_chunk(self, chunk: List[Dict[str, Any]]) -> Optional[Exception]:
+        """
+        Upsert one chunk of PlayerStats rows (camelCase keys)
+
+        Returns:
+            None if successful, otherwise the exception raised
+        """
+        try:
+            # return=minimal: the rows are not needed back, so skip the response body
+            self._player_stats_table.upsert(
+                chunk,
+                on_conflict='playerId,seasonYear,date',
+                returning=ReturnMethod.minimal
+            ).execute()
+            return None
 
         except Exception as e:
-            logger.error(f"Error fetching season total for player {player_id}: {e}")
-            return 0
+            return e
+
+    async def _upsert_stats_chunks_async(self, chunks: List[List[Dict[str, Any]]]) -> List[Optional[BaseException]]:
+        """
+        Upsert chunks of PlayerStats rows concurrently, at most MAX_CONCURRENT_UPSERTS at a time
+
+        Returns:
+            One entry per chunk: None if successful, otherwise the exception raised
+        """
+        options = AsyncClientOptions(postgrest_client_timeout=30)
+        client = await acreate_client(self.url, self.key, options=options)
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_UPSERTS)
+
+        async def upsert_chunk(chunk: List[Dict[str, Any]]) -> None:
+            async with semaphore:
+                await client.table('PlayerStats').upsert(
+                    chunk,
+                    on_conflict='playerId,seasonYear,date',
+                    returning=ReturnMethod.minimal
+                ).execute()
+
+        try:
+            results = await asyncio.gather(*(upsert_chunk(chunk) for chunk in chunks), return_exceptions=True)
+            # BaseException: gather also returns e.g. CancelledError, which isn't an Exception
+            return [result if isinstance(result, BaseException) else None for result in results]
+        finally:
+            await client.postgrest.aclose()
+
+    def _isolate_failed_stats_rows(self, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Retry a rejected chunk by halving it until the bad rows are isolated
+
+        A chunk with k bad rows costs O(k log n) requests instead of one per row.
+
+        Args:
+            rows: PlayerStats rows (camelCase keys) whose upsert as a whole failed
+
+        Returns:
+            The rows that could not be written
+        """
+        if len(rows) == 1:
+            row = rows[0]
+            logger.error(f"Error upserting stats for player {row['playerId']} on {row['date']}")
+            return rows
+
+        failed_rows = []
+        middle = len(rows) // 2
+
+        for half in (rows[:middle], rows[middle:]):
+            if self._upsert_stats_chunk(half) is not None:
+                failed_rows.extend(self._isolate_failed_stats_rows(half))
+
+        return failed_rows
+
+    def upsert_player_stats_batch(self, stats_records: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """
+        Bulk upsert multiple player stats records, reporting which ones failed
+
+        Records are sent in chunks of UPSERT_CHUNK_SIZE, one upsert request per chunk;
+        multiple chunks are sent concurrently. If the database rejects a chunk, it is
+        split in halves until the bad records are isolated, so a single bad record
+        doesn't fail the whole chunk.
+
+        Args:
+            stats_records: List of stats dictionaries with Python-friendly keys:
+                           player_id, season_year, date, hrs_daily, hrs_total, hrs_regular_season, hrs_postseason
+
+        Returns:
+            The records from stats_records that could not be written (empty if all succeeded)
+        """
+        # Map to the camelCase column names once for the whole batch
+        now = utc_now_iso()
+        rows = [
+            {
+                'playerId': record['player_id'],
+                'seasonYear': record['season_year'],
+                'date': record['date'],
+                'hrsDaily': record.get('hrs_daily', 0),
+                'hrsTotal': record['hrs_total'],
+                'hrsRegularSeason': record['hrs_regular_season'],
+                'hrsPostseason': record.get('hrs_postseason', 0),
+                'lastUpdated': now
+            }
+            for record in stats_records
+        ]
+        # Row dict identity -> input record, to report failures in the caller's format
+        record_for_row = {id(row): record for row, record in zip(rows, stats_records)}
+
+        chunks = list(chunked(rows))
+        if len(chunks) > 1:
+            errors = asyncio.run(self._upsert_stats_chunks_async(chunks))
+        else:
+            errors = [self._upsert_stats_chunk(chunk) for chunk in chunks]
+
+        for season_year in {row['seasonYear'] for row in rows}:
+            self._latest_date_cache.pop(season_year, None)
+
+        failed_rows = []
+        for chunk, error in zip(chunks, errors):
+            if error is None:
+                continue
+            if isinstance(error, APIError):
+                # Rejected by the database - bisect to find the bad record(s)
+                logger.warning(f"Bulk upsert of {len(chunk)} stats records failed, isolating bad records: {error}")
+                failed_rows.extend(self._isolate_failed_stats_rows(chunk))
+            else:
+                logger.error(f"Bulk upsert of {len(chunk)} stats records failed: {error}")
+                failed_rows.extend(chunk)
+
+        return [record_for_row[id(row)] for row in failed_rows]
 
     def bulk_upsert_player_stats(self, stats_records: List[Dict[str, Any]]) -> tuple[int, int]:
         """
@@ -214,23 +555,5 @@ class SupabaseDB:
         Returns:
             Tuple of (successful_count, error_count)
         """
-        success_count = 0
-        error_count = 0
-
-        for record in stats_records:
-            result = self.upsert_player_stats(
-                player_id=record['player_id'],
-                season_year=record['season_year'],
-                date=record['date'],
-                hrs_daily=record.get('hrs_daily', 0),
-                hrs_total=record['hrs_total'],
-                hrs_regular_season=record['hrs_regular_season'],
-                hrs_postseason=record.get('hrs_postseason', 0)
-            )
-
-            if result:
-                success_count += 1
-            else:
-                error_count += 1
-
-        return success_count, error_count
+        error_count = len(self.upsert_player_stats_batch(stats_records))
+        return len(stats_records) - error_count, error_count
@@ -16,10 +16,15 @@ For daily updates during the contest, use update_stats.py instead.
 
 import os
 import sys
+import asyncio
+import logging
 import argparse
-from datetime import datetime
-import requests
+from dataclasses import dataclass
+from operator import attrgetter
+import httpx
+import orjson
 from dotenv import load_dotenv
+from postgrest.types import ReturnMethod
 
 # Load environment variables from .env file
 # Look for .env in backend root directory (3 levels up from this script)
@@ -29,202 +34,351 @@ load_dotenv(env_path)
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
-from db_utils import SupabaseDB
-
-
-def fetch_season_leaders_paginated(season_year: int, min_home_runs: int = 9) -> list:
+from db_utils import SupabaseDB, chunked, utc_now_iso
+
+# Configure logging
+logging.basicConfig(
+    level=os.getenv('LOG_LEVEL', 'INFO'),
+    format='%(asctime)s - %(levelname)s - %(message)s',
+    datefmt='%Y-%m-%d %H:%M:%S'
+)
+logger = logging.getLogger(__name__)
+
+LEADERS_URL = "https://statsapi.mlb.com/api/v1/stats/leaders"
+PAGE_SIZE = 100
+
+
+@dataclass(frozen=True)
+class PlayerRow:
+    """One player's season home run total from the MLB leaderboard."""
+    # Declared by hand: dataclass(slots=True) needs Python 3.10
+    __slots__ = ('mlb_id', 'name', 'team_abbr', 'hrs_total', 'season_year')
+
+    mlb_id: str
+    name: str
+    team_abbr: str
+    hrs_total: int
+    season_year: int
+
+    def to_record(self) -> dict:
+        """Convert to the camelCase dictionary written to the database."""
+        return {
+            'mlbId': self.mlb_id,
+            'name': self.name,
+            'teamAbbr': self.team_abbr,
+            'hrsTotal': self.hrs_total,
+            'seasonYear': self.season_year
+        }
+
+
+async def _fetch_leaders_page(client: httpx.AsyncClient, params: dict, offset: int) -> dict:
+    """Fetch one leaderboard page starting at `offset`."""
+    response = await client.get(LEADERS_URL, params={**params, 'offset': offset})
+    response.raise_for_status()
+    return orjson.loads(response.content)
+
+
+async def fetch_season_leaders_paginated(season_year: int, min_home_runs: int = 9) -> list:
     """
     Fetch all players with >= min_home_runs for the specified season using pagination.
 
     The MLB Stats API leaderboard endpoint caps at ~100 results per call, but supports
-    offset pagination. This function fetches all pages and dedupes players who appear
-    multiple times (e.g., traded mid-season).
+    offset pagination. The first page reports the total number of entries, so the
+    remaining pages are requested concurrently. If that total is missing or too small,
+    paging continues one page at a time. Players who appear multiple times
+    (e.g., traded mid-season) are deduped.
 
     Args:
         season_year: MLB season year (e.g., 2025)
         min_home_runs: Minimum HRs required for eligibility (default: 9)
 
     Returns:
-        List of player data dictionaries with HR totals (deduped, sorted by HRs desc)
+        List of PlayerRow entries (deduped, sorted by HRs desc)
     """
-    print(f"Fetching season leaders for {season_year}...")
-    print(f"   Minimum threshold: {min_home_runs} home runs")
-
-    base_url = "https://statsapi.mlb.com/api/v1/stats/leaders"
-    all_players = {}  # Dedupe by mlbId, sum HRs for traded players
-    page_size = 100
-    offset = 0
+    logger.info("Fetching season leaders for %s (minimum %s home runs)...", season_year, min_home_runs)
+
+    params = {
+        'leaderCategories': 'homeRuns',
+        'season': season_year,
+        'sportId': 1,  # MLB only - skip minor-league entries
+        'limit': PAGE_SIZE,
+        'leaderGameTypes': 'R',  # Regular season only
+        'statGroup': 'hitting',
+        'hydrate': 'team'  # Include team data (abbreviation, name, etc.)
+    }
+    rows = []
     total_fetched = 0
 
+    def merge_page(data: dict, offset: int) -> bool:
+        """Add one page's rows; return True if the next page may still have eligible players."""
+        nonlocal total_fetched
+
+        # Navigate the response structure
+        if 'leagueLeaders' not in data:
+            logger.info("   Offset %s: no data", offset)
+            return False
+
+        page_rows = [
+            PlayerRow(
+                mlb_id=str(leader.get('person', {}).get('id', '')),
+                name=leader.get('person', {}).get('fullName', 'Unknown'),
+                team_abbr=leader.get('team', {}).get('abbreviation', 'FA'),
+                hrs_total=int(leader.get('value', 0)),
+                season_year=season_year
+            )
+            for league_leader in data['leagueLeaders']
+            for leader in league_leader.get('leaders', [])
+        ]
+        page_rows = [row for row in page_rows if row.mlb_id]
+        rows.extend(page_rows)
+
+        page_count = len(page_rows)
+        min_hr_on_page = min((row.hrs_total for row in page_rows), default=float('inf'))
+
+        total_fetched += page_count
+        logger.info("   Offset %s: got %s entries (min HR: %s)", offset, page_count, min_hr_on_page)
+
+        # Stop if we got fewer than page_size (no more data)
+        # or if the minimum HR on this page is below our threshold
+        if page_count < PAGE_SIZE:
+            logger.info("   Reached end of data")
+            return False
+
+        if min_hr_on_page < min_home_runs:
+            logger.info("   Reached players below %s HR threshold", min_home_runs)
+            return False
+
+        return True
+
     try:
-        while True:
-            params = {
-                'leaderCategories': 'homeRuns',
-                'season': season_year,
-                'limit': page_size,
-                'offset': offset,
-                'leaderGameTypes': 'R',  # Regular season only
-                'statGroup': 'hitting',
-                'hydrate': 'team'  # Include team data (abbreviation, name, etc.)
-            }
-
-            print(f"   Fetching offset {offset}...", end=' ')
-            response = requests.get(base_url, params=params, timeout=30)
-            response.raise_for_status()
-            data = response.json()
-
-            # Navigate the response structure
-            if 'leagueLeaders' not in data:
-                print("no data")
-                break
-
-            page_count = 0
-            min_hr_on_page = float('inf')
-
-            for league_leader in data['leagueLeaders']:
-                if 'leaders' not in league_leader:
-                    continue
-
-                for leader in league_leader['leaders']:
-                    hr_total = int(leader.get('value', 0))
-                    min_hr_on_page = min(min_hr_on_page, hr_total)
-
-                    player_data = leader.get('person', {})
-                    team_data = leader.get('team', {})
-
-                    player_id = str(player_data.get('id', ''))
-                    player_name = player_data.get('fullName', 'Unknown')
-                    team_abbr = team_data.get('abbreviation', 'FA')
-
-                    if player_id:
-                        if player_id not in all_players:
-                            # New player - add them
-                            all_players[player_id] = {
-                                'mlbId': player_id,
-                                'name': player_name,
-                                'teamAbbr': team_abbr,
-                                'hrsTotal': hr_total,
-                                'seasonYear': season_year
-                            }
-                        # else: Player already seen (traded) - keep first entry since
-                        # list is sorted by HRs desc and API shows total HRs per entry
-
-                        page_count += 1
-
-            total_fetched += page_count
-            print(f"got {page_count} entries (min HR: {min_hr_on_page})")
-
-            # Stop if we got fewer than page_size (no more data)
-            # or if the minimum HR on this page is below our threshold
-            if page_count < page_size:
-                print(f"   Reached end of data")
-                break
-
-            if min_hr_on_page < min_home_runs:
-                print(f"   Reached players below {min_home_runs} HR threshold")
-                break
-
-            offset += page_size
+        limits = httpx.Limits(max_keepalive_connections=10)
+        async with httpx.AsyncClient(http2=True, timeout=30, limits=limits) as client:
+            first_page = await _fetch_leaders_page(client, params, 0)
+
+            total_splits = max(
+                (leader.get('totalSplits', 0) for leader in first_page.get('leagueLeaders', [])),
+                default=0
+            )
+            offsets = range(PAGE_SIZE, total_splits, PAGE_SIZE)
+            logger.info("   %s leaderboard entries, fetching %s page(s)...", total_splits, len(offsets) + 1)
+
+            other_pages = await asyncio.gather(
+                *(_fetch_leaders_page(client, params, offset) for offset in offsets)
+            )
+
+            # Merge pages in offset order (HRs desc), so the threshold cut-off still applies
+            has_more = True
+            for page_number, data in enumerate([first_page, *other_pages]):
+                has_more = merge_page(data, page_number * PAGE_SIZE)
+                if not has_more:
+                    break
+
+            # totalSplits missing or too small: keep paging one page at a time
+            # until the end of data or the threshold, rather than truncating
+            offset = (len(other_pages) + 1) * PAGE_SIZE
+            if has_more:
+                logger.warning(
+                    "   totalSplits (%s) ended before the end of data or the HR threshold, "
+                    "continuing page by page from offset %s", total_splits, offset
+                )
+            while has_more:
+                data = await _fetch_leaders_page(client, params, offset)
+                has_more = merge_page(data, offset)
+                offset += PAGE_SIZE
+
+        # Dedupe traded players - keep first entry since the list is sorted by HRs desc
+        # and the API shows total HRs per entry
+        all_players: dict[str, PlayerRow] = {}
+        for row in rows:
+            all_players.setdefault(row.mlb_id, row)
 
         # Filter by minimum home runs and sort
-        eligible_players = [
-            p for p in all_players.values()
-            if p['hrsTotal'] >= min_home_runs
-        ]
-        eligible_players.sort(key=lambda x: x['hrsTotal'], reverse=True)
+        eligible_players = sorted(
+            (row for row in all_players.values() if row.hrs_total >= min_home_runs),
+            key=attrgetter('hrs_total'),
+            reverse=True
+        )
 
-        print(f"\n   Total entries fetched: {total_fetched}")
-        print(f"   Unique players: {len(all_players)}")
-        print(f"   Players with >= {min_home_runs} HRs: {len(eligible_players)}")
+        logger.info("   Total entries fetched: %s", total_fetched)
+        logger.info("   Unique players: %s", len(all_players))
+        logger.info("   Players with >= %s HRs: %s", min_home_runs, len(eligible_players))
 
         # Show top 5 and bottom 5
         if eligible_players:
-            print(f"\n   Top 5:")
+            logger.info("   Top 5:")
             for p in eligible_players[:5]:
-                print(f"      {p['name']} ({p['teamAbbr']}): {p['hrsTotal']} HRs")
-            print(f"   Bottom 5:")
+                logger.info("      %s (%s): %s HRs", p.name, p.team_abbr, p.hrs_total)
+            logger.info("   Bottom 5:")
             for p in eligible_players[-5:]:
-                print(f"      {p['name']} ({p['teamAbbr']}): {p['hrsTotal']} HRs")
+                logger.info("      %s (%s): %s HRs", p.name, p.team_abbr, p.hrs_total)
 
         return eligible_players
 
-    except requests.exceptions.RequestException as e:
-        print(f"ERROR: HTTP request failed: {e}")
+    except httpx.HTTPError as e:
+        logger.error("HTTP request failed: %s", e)
         return []
     except Exception as e:
-        print(f"ERROR: Error fetching season leaders: {e}")
-        import traceback
-        traceback.print_exc()
+        logger.exception("Error fetching season leaders: %s", e)
         return []
 
 
-def upsert_player_season_stats(supabase, players_data: list) -> dict:
+def _upsert_player_row(supabase, player: dict, results: dict, now: str) -> None:
     """
-    Insert or update players and their season stats in the database.
+    Upsert a single player and their season stats (fallback for failed bulk chunks).
 
     Args:
         supabase: Supabase client instance
-        players_data: List of player dictionaries with season stats
-
-    Returns:
-        Dictionary with success/failure counts
+        player: Player dictionary with season stats
+        results: Counters dictionary to update in place
+        now: ISO timestamp to record as updatedAt
     """
-    results = {
-        'players_created': 0,
-        'players_updated': 0,
-        'stats_created': 0,
-        'stats_updated': 0,
-        'errors': 0
-    }
-
-    print(f"\nUpserting {len(players_data)} players to database...")
-
-    for player in players_data:
-        try:
-            # 1. Upsert Player record
-            player_response = supabase.table('Player').upsert(
+    try:
+        # 1. Upsert Player record
+        player_response = supabase.table('Player').upsert(
+            {
+                'mlbId': player['mlbId'],
+                'name': player['name'],
+                'teamAbbr': player['teamAbbr'],
+                'updatedAt': now
+            },
+            on_conflict='mlbId'
+        ).execute()
+
+        if player_response.data:
+            player_id = player_response.data[0]['id']
+            results['players_upserted'] += 1
+
+            # 2. Upsert PlayerSeasonStats record
+            supabase.table('PlayerSeasonStats').upsert(
                 {
-                    'mlbId': player['mlbId'],
-                    'name': player['name'],
+                    'playerId': player_id,
+                    'seasonYear': player['seasonYear'],
+                    'hrsTotal': player['hrsTotal'],
                     'teamAbbr': player['teamAbbr'],
-                    'updatedAt': datetime.utcnow().isoformat()
+                    'updatedAt': now
                 },
-                on_conflict='mlbId'
+                on_conflict='playerId,seasonYear',
+                returning=ReturnMethod.minimal
             ).execute()
+            results['stats_upserted'] += 1
+
+            logger.debug("   OK %s: %s HRs", player['name'], player['hrsTotal'])
+
+    except Exception as e:
+        results['errors'] += 1
+        logger.error("   Error upserting %s: %s", player['name'], e)
 
-            if player_response.data:
-                player_id = player_response.data[0]['id']
 
-                # Check if this was an insert or update
-                existing_check = supabase.table('Player').select('id').eq('mlbId', player['mlbId']).execute()
-                if len(existing_check.data) == 1:
-                    results['players_updated'] += 1
-                else:
-                    results['players_created'] += 1
+def _upsert_player_chunks(supabase, players_data: list, results: dict) -> None:
+    """
+    Upsert players and season stats through the table API, in chunks.
+
+    Each chunk is one Player upsert and one PlayerSeasonStats upsert.
+    A chunk that fails is retried one player at a time.
+
+    Args:
+        supabase: Supabase client instance
+        players_data: List of player dictionaries with season stats
+        results: Counters dictionary to update in place
+    """
+    now = utc_now_iso()
 
-                # 2. Upsert PlayerSeasonStats record
-                stats_response = supabase.table('PlayerSeasonStats').upsert(
+    for chunk in chunked(players_data):
+        try:
+            # 1. Upsert Player records, then map mlbId -> id from the returned rows
+            player_response = supabase.table('Player').upsert(
+                [
                     {
-                        'playerId': player_id,
-                        'seasonYear': player['seasonYear'],
-                        'hrsTotal': player['hrsTotal'],
+                        'mlbId': player['mlbId'],
+                        'name': player['name'],
                         'teamAbbr': player['teamAbbr'],
-                        'updatedAt': datetime.utcnow().isoformat()
-                    },
-                    on_conflict='playerId,seasonYear'
-                ).execute()
+                        'updatedAt': now
+                    }
+                    for player in chunk
+                ],
+                on_conflict='mlbId'
+            ).execute()
 
-                if stats_response.data:
-                    results['stats_updated'] += 1
-                else:
-                    results['stats_created'] += 1
+            player_ids = {row['mlbId']: row['id'] for row in player_response.data or []}
+            results['players_upserted'] += len(player_ids)
+            results['errors'] += len(chunk) - len(player_ids)
 
-                print(f"   OK {player['name']}: {player['hrsTotal']} HRs")
+            # 2. Upsert PlayerSeasonStats records
+            stats_rows = [
+                {
+                    'playerId': player_ids[player['mlbId']],
+                    'seasonYear': player['seasonYear'],
+                    'hrsTotal': player['hrsTotal'],
+                    'teamAbbr': player['teamAbbr'],
+                    'updatedAt': now
+                }
+                for player in chunk
+                if player['mlbId'] in player_ids
+            ]
+
+            if stats_rows:
+                supabase.table('PlayerSeasonStats').upsert(
+                    stats_rows,
+                    on_conflict='playerId,seasonYear',
+                    returning=ReturnMethod.minimal
+                ).execute()
+                results['stats_upserted'] += len(stats_rows)
+
+            if logger.isEnabledFor(logging.DEBUG):
+                for player in chunk:
+                    if player['mlbId'] in player_ids:
+                        logger.debug("   OK %s: %s HRs", player['name'], player['hrsTotal'])
 
         except Exception as e:
-            results['errors'] += 1
-            print(f"   ERROR: Error upserting {player['name']}: {e}")
+            logger.warning("   Bulk upsert of %s players failed, retrying one at a time: %s", len(chunk), e)
+            for player in chunk:
+                _upsert_player_row(supabase, player, results, now)
+
+
+def upsert_player_season_stats(supabase, players: list) -> dict:
+    """
+    Insert or update players and their season stats in the database.
+
+    Everything is written by one call to the upsert_eligibility Postgres function
+    (migrations/add_upsert_eligibility_function.sql), set-based and in a single
+    transaction. If that call fails, e.g. the function is not deployed yet, falls
+    back to chunked table upserts.
+
+    Args:
+        supabase: Supabase client instance
+        players: List of PlayerRow entries
+
+    Returns:
+        Dictionary with success/failure counts
+    """
+    results = {
+        'players_upserted': 0,
+        'stats_upserted': 0,
+        'errors': 0
+    }
+
+    logger.info("Upserting %s players to database...", len(players))
+
+    players_data = [player.to_record() for player in players]
+
+    try:
+        response = supabase.rpc('upsert_eligibility', {'payload': players_data}).execute()
+        results['players_upserted'] = len(players_data)
+        results['stats_upserted'] = response.data[0]['stats_upserted'] if response.data else 0
+
+        # Every player should get a PlayerSeasonStats row; any shortfall is an error
+        results['errors'] = len(players_data) - results['stats_upserted']
+        if results['errors']:
+            logger.error(
+                "   upsert_eligibility wrote %s of %s season stats rows",
+                results['stats_upserted'], len(players_data)
+            )
+        return results
+
+    except Exception as e:
+        logger.warning("   upsert_eligibility RPC failed, falling back to table upserts: %s", e)
 
+    _upsert_player_chunks(supabase, players_data, results)
     return results
 
 
@@ -257,7 +411,7 @@ def main():
     print()
 
     # Step 1: Fetch eligible players from MLB API with pagination
-    players_data = fetch_season_leaders_paginated(args.season, args.min_hrs)
+    players_data = asyncio.run(fetch_season_leaders_paginated(args.season, args.min_hrs))
 
     if not players_data:
         print("\nWARNING: No eligible players found. Check the season year and threshold.")
@@ -279,8 +433,8 @@ def main():
     print("IMPORT SUMMARY")
     print("=" * 60)
     print(f"Players processed: {len(players_data)}")
-    print(f"Players created/updated: {results['players_created'] + results['players_updated']}")
-    print(f"Season stats created/updated: {results['stats_created'] + results['stats_updated']}")
+    print(f"Players created/updated: {results['players_upserted']}")
+    print(f"Season stats created/updated: {results['stats_upserted']}")
     print(f"Errors: {results['errors']}")
     print("=" * 60)
 
@@ -5,6 +5,7 @@ Updates Supabase database with daily aggregated totals
 
 Usage:
     python update_stats.py [--date YYYY-MM-DD] [--season-year YYYY]
+    python update_stats.py --start-date YYYY-MM-DD --end-date YYYY-MM-DD [--season-year YYYY]
 
 If no date provided, uses yesterday's date
 If no season-year provided, uses current year
@@ -12,12 +13,21 @@ If no season-year provided, uses current year
 
 import os
 import sys
+import asyncio
 import logging
 import argparse
+import shelve
+import tempfile
+import threading
 from datetime import datetime, timedelta
-from typing import Dict, List, Tuple
-from collections import defaultdict
+from typing import Dict, List, Optional, Tuple, Union
+from collections import Counter
+import httpx
+import orjson
 import pytz
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Add parent directory to path for imports
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
@@ -37,6 +47,24 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+BOXSCORE_URL = "https://statsapi.mlb.com/api/v1/game/{game_id}/boxscore"
+MAX_CONCURRENT_REQUESTS = 20
+MAX_CONCURRENT_DATES = 4  # Backfill dates fetched at once; each date fans out to its games
+
+# Finished games' box scores never change, so their per-player HR counts are cached on disk across runs
+BOXSCORE_CACHE_PATH = os.getenv('BOXSCORE_CACHE_PATH', os.path.join(tempfile.gettempdir(), 'mlb_game_hrs'))
+FINAL_STATUSES = ('Final', 'Game Over', 'Completed Early')
+
+
+def is_final(game: Dict) -> bool:
+    """
+    Check whether a schedule entry's game is finished
+
+    Matches on the part before any reason suffix, e.g. "Completed Early: Rain"
+    or "Final: Tied" both count as final.
+    """
+    return (game.get('status') or '').split(':')[0] in FINAL_STATUSES
+
 
 class MLBStatsUpdater:
     """Handles fetching and updating MLB player statistics"""
@@ -50,11 +78,64 @@ class MLBStatsUpdater:
         """
         self.season_year = season_year
         self.db = SupabaseDB()
+
+        # Pooled keep-alive session with retries for MLB-StatsAPI calls
+        self._session = requests.Session()
+        retry = Retry(total=3, backoff_factor=0.3, status_forcelist=(500, 502, 503, 504))
+        adapter = HTTPAdapter(pool_connections=20, pool_maxsize=20, max_retries=retry)
+        self._session.mount('https://', adapter)
+
+        # statsapi.get() calls the module-level requests.get(); route it through the session
+        # (the original is put back in close())
+        self._statsapi_requests = statsapi.requests
+        statsapi.requests = self._session
+
+        # MLB ID -> player record, built once per run (see _load_player_map)
+        self._player_map: Optional[Dict[int, Dict]] = None
+
+        # date -> statsapi.schedule() result, for dates revisited within this run
+        self._schedule_cache: Dict[str, List[Dict]] = {}
+
+        # shelve/dbm files can't be opened concurrently by backfill worker threads
+        self._boxscore_cache_lock = threading.Lock()
+
         logger.info(f"🏟️  MLB Stats Updater initialized for {season_year} season")
 
+    def close(self):
+        """Close pooled HTTP connections and give statsapi back its own requests module"""
+        if statsapi.requests is self._session:
+            statsapi.requests = self._statsapi_requests
+        self._session.close()
+
+    def __enter__(self) -> 'MLBStatsUpdater':
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _get_schedule(self, date_str: str) -> List[Dict]:
+        """
+        Get the MLB schedule for a date, reusing an earlier fetch within this run
+
+        Today's schedule is always fetched fresh since its game statuses are still changing.
+
+        Args:
+            date_str: Date in YYYY-MM-DD format
+
+        Returns:
+            List of game dictionaries from statsapi.schedule
+        """
+        today = datetime.now(pytz.timezone('America/New_York')).strftime('%Y-%m-%d')
+        if date_str >= today:
+            return statsapi.schedule(date=date_str)
+
+        if date_str not in self._schedule_cache:
+            self._schedule_cache[date_str] = statsapi.schedule(date=date_str)
+        return self._schedule_cache[date_str]
+
     def get_games_for_date(self, date_str: str) -> List[Dict]:
         """
-        Get all MLB games for a specific date
+        Get all completed regular season MLB games for a specific date
 
         Args:
             date_str: Date in YYYY-MM-DD format
@@ -66,7 +147,7 @@ class MLBStatsUpdater:
             logger.info(f"📅 Fetching games for {date_str}...")
 
             # Get schedule for the date
-            schedule = statsapi.schedule(date=date_str)
+            schedule = self._get_schedule(date_str)
 
             if not schedule:
                 logger.info(f"   No games found for {date_str}")
@@ -78,51 +159,133 @@ class MLBStatsUpdater:
                 if game.get('game_type') == 'R'  # R = Regular Season
             ]
 
-            logger.info(f"   Found {len(regular_season_games)} regular season games")
-            return regular_season_games
+            # Only finished games have final HR counts - skip in-progress/postponed/future games
+            final_games = [
+                game for game in regular_season_games
+                if is_final(game)
+            ]
+
+            logger.info(f"   Found {len(final_games)} completed regular season games")
+            skipped = len(regular_season_games) - len(final_games)
+            if skipped:
+                logger.info(f"   Skipped {skipped} games not yet final (in progress, postponed or scheduled)")
+            return final_games
 
         except Exception as e:
             logger.error(f"❌ Error fetching games for {date_str}: {e}")
             return []
 
-    def get_player_hrs_from_game(self, game_id: int) -> Dict[int, int]:
+    async def _fetch_boxscores(self, game_ids: List[int]) -> List[Union[Dict, BaseException]]:
+        """
+        Fetch raw box scores for many games concurrently
+
+        Args:
+            game_ids: MLB game IDs
+
+        Returns:
+            Box score JSON per game (same order as game_ids), or the exception raised fetching it
+        """
+        limits = httpx.Limits(max_connections=MAX_CONCURRENT_REQUESTS)
+        async with httpx.AsyncClient(http2=True, timeout=30, limits=limits) as client:
+
+            async def fetch(game_id: int) -> Dict:
+                response = await client.get(BOXSCORE_URL.format(game_id=game_id))
+                response.raise_for_status()
+                return orjson.loads(response.content)
+
+            return await asyncio.gather(*(fetch(game_id) for game_id in game_ids), return_exceptions=True)
+
+    def get_game_hrs(self, games: List[Dict]) -> List[Union[Dict[int, int], BaseException]]:
+        """
+        Get per-player home run counts for games, serving finished games from the on-disk cache
+
+        Only each game's HR counts are cached, not the whole box score, and only for
+        games whose schedule status is final, so in-progress games are always fetched fresh.
+
+        Args:
+            games: Game dictionaries from get_games_for_date
+
+        Returns:
+            Dictionary mapping MLB player ID to HR count per game (same order as games),
+            or the exception raised fetching that game's box score
+        """
+        final_ids = {game['game_id'] for game in games if is_final(game)}
+
+        # The cache is only an optimization - if it can't be opened (missing directory,
+        # lock held by an overlapping run, corrupt file) fall back to the network
+        try:
+            with self._boxscore_cache_lock, shelve.open(BOXSCORE_CACHE_PATH) as cache:
+                game_hrs = {
+                    game_id: cache[f'hrs:{game_id}']
+                    for game_id in final_ids
+                    if f'hrs:{game_id}' in cache
+                }
+        except Exception as e:
+            logger.warning(f"   ⚠️  Box score cache unavailable, fetching all games: {e}")
+            game_hrs = {}
+
+        to_fetch = [game['game_id'] for game in games if game['game_id'] not in game_hrs]
+        if to_fetch:
+            logger.info(f"   Fetching {len(to_fetch)} box scores ({len(game_hrs)} cached)")
+            boxscores = asyncio.run(self._fetch_boxscores(to_fetch))
+
+            to_cache = {}
+            for game_id, boxscore in zip(to_fetch, boxscores):
+                if isinstance(boxscore, BaseException):
+                    game_hrs[game_id] = boxscore
+                    continue
+
+                game_hrs[game_id] = self.get_player_hrs_from_game(game_id, boxscore)
+                # Don't pin a malformed response's (empty) counts for good
+                if game_id in final_ids and 'teams' in boxscore:
+                    to_cache[f'hrs:{game_id}'] = game_hrs[game_id]
+
+            if to_cache:
+                try:
+                    with self._boxscore_cache_lock, shelve.open(BOXSCORE_CACHE_PATH) as cache:
+                        cache.update(to_cache)
+                except Exception as e:
+                    logger.warning(f"   ⚠️  Could not write box score cache: {e}")
+
+        return [game_hrs[game['game_id']] for game in games]
+
+    def get_player_hrs_from_game(self, game_id: int, boxscore: Dict) -> Dict[int, int]:
         """
         Extract home run counts for each player from a single game
 
         Args:
             game_id: MLB game ID
+            boxscore: Raw box score JSON from the MLB Stats API (/game/{id}/boxscore)
 
         Returns:
             Dictionary mapping MLB player ID to HR count in that game
         """
-        player_hrs = defaultdict(int)
+        player_hrs = {}
 
         try:
-            # Get box score for game
-            boxscore = statsapi.boxscore_data(game_id)
-
             # Process both away and home teams
-            for team_type in ['away', 'home']:
-                team_stats = boxscore.get(team_type, {})
-                batters = team_stats.get('batters', [])
+            teams = boxscore.get('teams') or {}
+            for team_type in ('away', 'home'):
+                team_stats = teams.get(team_type) or {}
 
-                for batter_id in batters:
-                    # Get batter stats
-                    batter_stats = team_stats.get('players', {}).get(f'ID{batter_id}', {})
-                    stats = batter_stats.get('stats', {}).get('batting', {})
+                # Walk the players dict once instead of resolving each batters ID into it;
+                # players who didn't bat have an empty batting block
+                for player in (team_stats.get('players') or {}).values():
+                    stats = (player.get('stats') or {}).get('batting') or {}
 
                     # Extract home runs
                     hrs = stats.get('homeRuns', 0)
 
                     if hrs > 0:
-                        player_hrs[batter_id] = hrs
-                        player_name = batter_stats.get('person', {}).get('fullName', 'Unknown')
-                        logger.debug(f"      {player_name}: {hrs} HR(s)")
+                        person = player.get('person', {})
+                        player_hrs[person['id']] = hrs
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("      %s: %d HR(s)", person.get('fullName', 'Unknown'), hrs)
 
         except Exception as e:
             logger.error(f"   ⚠️  Error processing game {game_id}: {e}")
 
-        return dict(player_hrs)
+        return player_hrs
 
     def get_daily_hr_totals(self, date_str: str) -> Dict[int, int]:
         """
@@ -134,7 +297,7 @@ class MLBStatsUpdater:
         Returns:
             Dictionary mapping MLB player ID to total HRs for that day
         """
-        daily_totals = defaultdict(int)
+        daily_totals = Counter()
 
         # Get all games for the date
         games = self.get_games_for_date(date_str)
@@ -144,31 +307,101 @@ class MLBStatsUpdater:
 
         logger.info(f"🔍 Processing {len(games)} games for home run data...")
 
+        # Fetch every box score at once - wall time is the slowest game, not the sum
+        hrs_by_game = self.get_game_hrs(games)
+
         # Process each game
-        for game in games:
+        for game, game_hrs in zip(games, hrs_by_game):
             game_id = game.get('game_id')
-            game_desc = f"{game.get('away_name')} @ {game.get('home_name')}"
 
-            logger.debug(f"   Processing: {game_desc} (ID: {game_id})")
+            if isinstance(game_hrs, BaseException):
+                logger.error(f"   ⚠️  Error processing game {game_id}: {game_hrs}")
+                continue
 
-            # Get HRs from this game
-            game_hrs = self.get_player_hrs_from_game(game_id)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("   Processing: %s @ %s (ID: %s)", game.get('away_name'), game.get('home_name'), game_id)
 
             # Aggregate into daily totals
-            for player_id, hrs in game_hrs.items():
-                daily_totals[player_id] += hrs
+            daily_totals.update(game_hrs)
 
         total_hrs = sum(daily_totals.values())
         logger.info(f"✅ Found {total_hrs} home runs across {len(daily_totals)} players")
 
         return dict(daily_totals)
 
-    def update_player_stats_for_date(self, date_str: str) -> Tuple[int, int, int]:
+    def _load_player_map(self) -> Dict[int, Dict]:
+        """
+        Get the MLB ID to player record mapping, loading it on first use
+
+        The players table only changes when eligibility is re-imported, so the
+        mapping is built once and reused for every date processed in this run.
+
+        Returns:
+            Dictionary mapping MLB player ID to player record
+        """
+        if self._player_map is not None:
+            return self._player_map
+
+        # Get all players from database
+        logger.info("📋 Loading player records from database...")
+        all_players = self.db.get_all_players()
+        logger.info(f"   Found {len(all_players)} players in database")
+
+        # Create MLB ID to Player mapping (mlbPlayerId is generated from mlbId by Postgres)
+        if all_players and 'mlbPlayerId' not in all_players[0]:
+            logger.warning("⚠️  Player.mlbPlayerId not found - run migrations/add_player_mlb_player_id.sql. Parsing mlbId instead")
+            mlb_id_to_player = {}
+            for player in all_players:
+                # Handle both formats: "656941" or "mlb-656941" (isdigit() is False for "")
+                mlb_id = (player.get('mlbId') or '').removeprefix('mlb-')
+                if mlb_id.isdigit():
+                    mlb_id_to_player[int(mlb_id)] = player
+        else:
+            mlb_id_to_player = {
+                player['mlbPlayerId']: player
+                for player in all_players
+                if player['mlbPlayerId'] is not None
+            }
+
+        logger.info(f"   Mapped {len(mlb_id_to_player)} players with valid MLB IDs")
+
+        # get_all_players() returns [] on error - don't pin an empty map for the whole run
+        if mlb_id_to_player:
+            self._player_map = mlb_id_to_player
+        return mlb_id_to_player
+
+    async def _fetch_daily_hr_totals(self, dates: List[str]) -> List[Dict[int, int]]:
+        """
+        Fetch daily HR totals for many dates concurrently
+
+        Each date runs get_daily_hr_totals in a worker thread, at most
+        MAX_CONCURRENT_DATES at a time to stay polite to the MLB Stats API.
+
+        Args:
+            dates: Dates in YYYY-MM-DD format
+
+        Returns:
+            Daily HR totals per date (same order as dates)
+        """
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_DATES)
+
+        async def fetch(date_str: str) -> Dict[int, int]:
+            async with semaphore:
+                return await asyncio.to_thread(self.get_daily_hr_totals, date_str)
+
+        return await asyncio.gather(*(fetch(date_str) for date_str in dates))
+
+    def update_player_stats_for_date(
+        self,
+        date_str: str,
+        daily_hrs: Optional[Dict[int, int]] = None,
+    ) -> Tuple[int, int, int]:
         """
         Update database with player stats for a specific date
 
         Args:
             date_str: Date in YYYY-MM-DD format
+            daily_hrs: Pre-fetched HR totals for the date (fetched from the MLB API if None)
 
         Returns:
             Tuple of (updated_count, created_count, skipped_count)
@@ -178,79 +411,87 @@ class MLBStatsUpdater:
         logger.info(f"{'='*60}\n")
 
         # Get daily HR totals from MLB API
-        daily_hrs = self.get_daily_hr_totals(date_str)
+        if daily_hrs is None:
+            daily_hrs = self.get_daily_hr_totals(date_str)
 
         if not daily_hrs:
             logger.warning("⚠️  No home runs found for this date. Games may not have been played or completed.")
             return 0, 0, 0
 
-        # Get all players from database
-        logger.info("📋 Loading player records from database...")
-        all_players = self.db.get_all_players()
-        logger.info(f"   Found {len(all_players)} players in database")
-
-        # Create MLB ID to Player mapping
-        mlb_id_to_player = {}
-        for player in all_players:
-            mlb_id = player.get('mlbId', '')
-            if mlb_id:
-                # Handle both formats: "656941" or "mlb-656941"
-                if mlb_id.startswith('mlb-'):
-                    mlb_player_id = int(mlb_id.replace('mlb-', ''))
-                elif mlb_id.isdigit():
-                    mlb_player_id = int(mlb_id)
-                else:
-                    continue
-                mlb_id_to_player[mlb_player_id] = player
-
-        logger.info(f"   Mapped {len(mlb_id_to_player)} players with valid MLB IDs")
+        mlb_id_to_player = self._load_player_map()
 
         # Process each player who hit HRs
         updated_count = 0
         created_count = 0
         skipped_count = 0
 
+        # Load season totals as of the day before this date for every mapped HR hitter in
+        # one query, so re-running a date or backfilling before later rows doesn't double-count
+        season_totals = self.db.get_player_season_totals(
+            self.season_year,
+            [mlb_id_to_player[mlb_player_id]['id'] for mlb_player_id in daily_hrs if mlb_player_id in mlb_id_to_player],
+            before_date=date_str
+        )
+
+        # Without the previous totals every hrsTotal would be reset to the day's count
+        if season_totals is None:
+            raise RuntimeError(f"Could not load season totals for {self.season_year}; not writing stats for {date_str}")
+
         logger.info(f"\n💾 Updating database records...\n")
 
+        stats_records = []
+        written_as = {}  # player_id -> (name, season total before this date), for the summary
+
         for mlb_player_id, daily_hr_count in daily_hrs.items():
             player = mlb_id_to_player.get(mlb_player_id)
 
             if not player:
                 # Player not in our database (doesn't meet eligibility criteria)
-                logger.debug(f"   Skipped MLB player {mlb_player_id} (not in database)")
+                logger.debug("   Skipped MLB player %s (not in database)", mlb_player_id)
                 skipped_count += 1
                 continue
 
             player_id = player['id']
-            player_name = player['name']
 
-            # Get current season total (most recent stats record)
-            current_total = self.db.get_player_season_total(player_id, self.season_year)
+            # Season total before this date (most recent earlier stats record)
+            current_total = season_totals.get(player_id, 0)
+            written_as[player_id] = (player['name'], current_total)
 
             # Calculate new cumulative total
             new_total = current_total + daily_hr_count
 
-            # Upsert stats for this date
-            success = self.db.upsert_player_stats(
-                player_id=player_id,
-                season_year=self.season_year,
-                date=date_str,
-                hrs_daily=daily_hr_count,  # HRs hit on this specific date
-                hrs_total=new_total,
-                hrs_regular_season=new_total,  # Only regular season games included
-                hrs_postseason=0  # Always 0 for our contest
-            )
-
-            if success:
+            stats_records.append({
+                'player_id': player_id,
+                'season_year': self.season_year,
+                'date': date_str,
+                'hrs_daily': daily_hr_count,  # HRs hit on this specific date
+                'hrs_total': new_total,
+                'hrs_regular_season': new_total,  # Only regular season games included
+                'hrs_postseason': 0  # Always 0 for our contest
+            })
+
+        # Upsert all stats for this date in bulk
+        if stats_records:
+            failed_records = self.db.upsert_player_stats_batch(stats_records)
+            if failed_records:
+                logger.error(f"   ✗ Failed to write {len(failed_records)} of {len(stats_records)} stats records")
+                skipped_count += len(failed_records)
+
+            # Only count and report the rows that were actually written
+            failed_ids = {record['player_id'] for record in failed_records}
+            changes = []  # "name cur→new" per player, logged as one line
+            for record in stats_records:
+                if record['player_id'] in failed_ids:
+                    continue
+                player_name, current_total = written_as[record['player_id']]
                 if current_total > 0:
                     updated_count += 1
-                    logger.info(f"   ✓ {player_name}: {current_total} → {new_total} HRs (+{daily_hr_count})")
                 else:
                     created_count += 1
-                    logger.info(f"   ➕ {player_name}: First HR(s) of season! ({new_total} total)")
-            else:
-                logger.error(f"   ✗ Failed to update {player_name}")
-                skipped_count += 1
+                changes.append(f"{player_name} {current_total}→{record['hrs_total']}")
+
+            if changes:
+                logger.info("   ✓ %d players (season HRs before→after): %s", len(changes), ", ".join(changes))
 
         return updated_count, created_count, skipped_count
 
@@ -275,38 +516,97 @@ class MLBStatsUpdater:
             # Update stats for the date
             updated, created, skipped = self.update_player_stats_for_date(date_str)
 
-            # Print summary
-            logger.info(f"\n{'='*60}")
-            logger.info(f"📊 UPDATE SUMMARY")
-            logger.info(f"{'='*60}")
-            logger.info(f"   Date: {date_str}")
-            logger.info(f"   Season: {self.season_year}")
-            logger.info(f"   ✅ Updated: {updated}")
-            logger.info(f"   ➕ Created: {created}")
-            logger.info(f"   ⏭️  Skipped: {skipped}")
-            logger.info(f"{'='*60}\n")
-
+            self._log_summary(date_str, updated, created, skipped)
             return True
 
         except Exception as e:
             logger.error(f"\n❌ Stats update failed: {e}", exc_info=True)
             return False
 
+    def run_range(self, start_date: str, end_date: str) -> bool:
+        """
+        Backfill stats for every date from start_date to end_date (inclusive)
+
+        Games and box scores for all dates are fetched concurrently. Database
+        writes then run one date at a time in date order, because each date's
+        cumulative total builds on the previous date's row.
+
+        Args:
+            start_date: First date to process (YYYY-MM-DD)
+            end_date: Last date to process (YYYY-MM-DD)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        try:
+            start = datetime.strptime(start_date, '%Y-%m-%d')
+            end = datetime.strptime(end_date, '%Y-%m-%d')
+            dates = [
+                (start + timedelta(days=offset)).strftime('%Y-%m-%d')
+                for offset in range((end - start).days + 1)
+            ]
+            if not dates:
+                logger.error(f"❌ --start-date {start_date} is after --end-date {end_date}")
+                return False
+
+            logger.info(f"📆 Backfilling {len(dates)} dates: {start_date} to {end_date}")
+
+            # Load the player map once up front, shared by every date
+            self._load_player_map()
+
+            daily_hrs_by_date = asyncio.run(self._fetch_daily_hr_totals(dates))
+
+            updated = created = skipped = 0
+            for date_str, daily_hrs in zip(dates, daily_hrs_by_date):
+                date_updated, date_created, date_skipped = self.update_player_stats_for_date(date_str, daily_hrs)
+                updated += date_updated
+                created += date_created
+                skipped += date_skipped
+
+            self._log_summary(f"{start_date} to {end_date}", updated, created, skipped)
+            return True
+
+        except Exception as e:
+            logger.error(f"\n❌ Stats backfill failed: {e}", exc_info=True)
+            return False
+
+    def _log_summary(self, date_label: str, updated: int, created: int, skipped: int):
+        """Print the end-of-run summary"""
+        logger.info(f"\n{'='*60}")
+        logger.info(f"📊 UPDATE SUMMARY")
+        logger.info(f"{'='*60}")
+        logger.info(f"   Date: {date_label}")
+        logger.info(f"   Season: {self.season_year}")
+        logger.info(f"   ✅ Updated: {updated}")
+        logger.info(f"   ➕ Created: {created}")
+        logger.info(f"   ⏭️  Skipped: {skipped}")
+        logger.info(f"{'='*60}\n")
+
 
 def main():
     """Main entry point"""
     parser = argparse.ArgumentParser(description='Update MLB player stats from MLB-StatsAPI')
     parser.add_argument('--date', type=str, help='Date to process (YYYY-MM-DD). Defaults to yesterday.')
+    parser.add_argument('--start-date', type=str, help='First date of a backfill range (YYYY-MM-DD). Requires --end-date.')
+    parser.add_argument('--end-date', type=str, help='Last date of a backfill range (YYYY-MM-DD), inclusive.')
     parser.add_argument('--season-year', type=int, help='Season year (e.g., 2026). Defaults to env var or current year.')
 
     args = parser.parse_args()
 
+    if bool(args.start_date) != bool(args.end_date):
+        parser.error('--start-date and --end-date must be used together')
+    if args.date and args.start_date:
+        parser.error('--date cannot be combined with --start-date/--end-date')
+
     # Get season year from args, env, or default to current year
     season_year = args.season_year or int(os.getenv('SEASON_YEAR', datetime.now().year))
 
     # Create updater and run
-    updater = MLBStatsUpdater(season_year=season_year)
-    success = updater.run(date_str=args.date)
+    with MLBStatsUpdater(season_year=season_year) as updater:
+        if args.start_date:
+            success = updater.run_range(args.start_date, args.end_date)
+        else:
+            success = updater.run(date_str=args.date)
 
     # Exit with appropriate code
     sys.exit(0 if success else 1)